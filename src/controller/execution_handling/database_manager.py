@@ -266,7 +266,7 @@ class DatabaseManager(AbstractManager, DatasetFacadeConsumer, DataFacadeConsumer
     @type_check(UUID)
     def open_dataset(self, uuid: UUID) -> bool:
 
-        if self._dataset_facade.set_current_dataset(uuid) is None:
+        if not self._dataset_facade.set_current_dataset(uuid):
             self.handle_error([self._dataset_facade], " at opening dataset in manager")
             return False
 
@@ -2,6 +2,8 @@ from src.data_transfer.content.error import ErrorMessage
 
 
 class ErrorRecord:
+    __slots__ = ("_error_type", "_args")
+
     def __init__(self, error_type: ErrorMessage, args: str = ""):
         """
         Constructor for a new Error Record
@@ -24,17 +24,14 @@ class DatabaseConnection:
         self.password: str = password
         self.database: str = database
         self.port: str = port
-        # create engine with the given parameters.
+        # create engine with the given parameters. Connections are pooled and pinged on checkout.
         self.engine = create_engine(f'postgresql://{user}:{password}@{host}:{port}/{database}', echo=False,
-                                    pool_size=20, max_overflow=30)
-        # check if the engine is valid.
+                                    pool_size=20, max_overflow=30, pool_pre_ping=True)
         self.connection: Optional[Connection] = None
 
-
-
     def get_connection(self) -> Connection:
         """
-        Returns the connection to the database. If the connection is closed or not set, a new connection is created.
+        Returns a connection to the database checked out of the connection pool.
         :return: The connection to the database.
         """
         try:
@@ -43,16 +40,24 @@ class DatabaseConnection:
             self.connection = None
             raise DatabaseConnectionError(e.args)
 
-        if self.connection.closed:
-            self.connection = self.engine.connect()
-            log_query("Connection established.")
-        else:
-            log_query("Connection already established.")
+        log_query("Connection established.")
         return self.connection
 
+    def connect(self) -> Connection:
+        """
+        Returns a connection checked out of the connection pool for use in a with statement. Leaving the with
+        block rolls back anything uncommitted and returns the connection to the pool, so read only queries need no
+        post_connection.
+        :return: The connection to the database.
+        """
+        try:
+            return self.engine.connect()
+        except sqlalchemy.exc.OperationalError as e:
+            raise DatabaseConnectionError(e.args)
+
     def post_connection(self):
         """
-        Closes the connection to the database.
+        Commits and closes the connection, which returns it to the connection pool.
         """
         """if self.connection is not None and not self.connection.closed:
             self.connection.commit()
@@ -7,8 +7,11 @@ from src.data_transfer.exception import InvalidInput
 from src.data_transfer.record import DataRecord
 from src.database.data_facade import DataFacade
 from src.database.sql_querys import SQLQueries
+from src.database.sql_querys import array_literal
 from src.database.table_adapter import TableAdapter
 
+NEGATED_FILTER: str = "NOT({filter})"
+
 
 class PostgreSQLDataFacade(DataFacade):
     """
@@ -31,12 +34,15 @@ class PostgreSQLDataFacade(DataFacade):
         """
         self.table_adapter = table_adapter
 
-    def check_table_adapter(self):
+    def check_table_adapter(self) -> TableAdapter:
         """
         checks whether the table adapter is None
+        :return: the table adapter of the opened dataset
         """
-        if self.table_adapter is None:
+        table_adapter = self.table_adapter
+        if table_adapter is None:
             raise RuntimeError("Dataset can't be accessed before opening an Dataset.")
+        return table_adapter
 
     def set_point_filter(self, filter_str: str, use_filter: bool, negate_filter: bool) -> None:
         self.check_table_adapter()
@@ -45,7 +51,7 @@ class PostgreSQLDataFacade(DataFacade):
             return None
 
         if negate_filter:
-            self.filter = SQLQueries.NOT.value.format(filter=filter_str)
+            self.filter = NEGATED_FILTER.format(filter=filter_str)
         else:
             self.filter = filter_str
         self.use_filter = use_filter
@@ -59,36 +65,39 @@ class PostgreSQLDataFacade(DataFacade):
         self.use_trajectory_filter = use_filter
 
     def get_data(self, returned_columns: List[Column], usefilter: bool = True) -> Optional[DataRecord]:
-        self.check_table_adapter()
+        table_adapter = self.check_table_adapter()
         str_columns: List[str] = list()
 
         for column in returned_columns:
             str_columns.append(column.value)
 
-        query = SQLQueries.SELECT.value.format(columns=", ".join(str_columns))
-        query += SQLQueries.FROM.value
-
         if usefilter is True and self.filter is not None:
-            query += SQLQueries.WHERE.value.format(filter=self.filter)
+            query = SQLQueries.SELECTFILTERED.render(columns=", ".join(str_columns), tablename=table_adapter.key,
+                                                     filter=self.filter)
+        else:
+            query = SQLQueries.SELECT_FROM.render(columns=", ".join(str_columns), tablename=table_adapter.key)
 
-        data = self.table_adapter.query_sql(query)
+        data = table_adapter.query_sql(query)
         if data is None:
-            for error in self.table_adapter.get_errors():
+            for error in table_adapter.get_errors():
                 self.throw_error(error.error_type, error.args)
             return None
         return data
 
     def get_distinct_data_from_column(self, returned_column: Column) -> Optional[DataRecord]:
 
-        self.check_table_adapter()
-        query = SQLQueries.SELECT.value.format(columns=returned_column.value) \
-                + SQLQueries.FROM.value \
-                + SQLQueries.GROUPED.value.format(columns=returned_column.value)
-        data = self.table_adapter.query_sql(query)
+        table_adapter = self.check_table_adapter()
+        data = table_adapter.distinct_values.get(returned_column.value)
+        if data is not None:
+            return data
+
+        query = SQLQueries.SELECTGROUPED.render(columns=returned_column.value, tablename=table_adapter.key)
+        data = table_adapter.query_sql(query)
         if data is None:
-            for error in self.table_adapter.get_errors():
+            for error in table_adapter.get_errors():
                 self.throw_error(error.error_type, error.args)
             return None
+        table_adapter.distinct_values[returned_column.value] = data
         return data
 
     def get_data_of_column_selection(self, returned_columns: List[Column], chosen_elements: List,
@@ -96,46 +105,43 @@ class PostgreSQLDataFacade(DataFacade):
         if len(chosen_elements) == 0 or chosen_column is None:
             raise InvalidInput("No elements selected")
 
-        self.check_table_adapter()
+        table_adapter = self.check_table_adapter()
         str_columns: List[str] = list()
         for column in returned_columns:
             str_columns.append(column.value)
 
-        query = SQLQueries.SELECT.value.format(columns=", ".join(str_columns))
-        query += SQLQueries.FROM.value
-        str_values: List[str] = list()
-        for value in chosen_elements:
-            str_values.append("'" + value.__str__() + "'")
-
-        query += SQLQueries.WHEREIN.value.format(column=chosen_column.value, values=", ".join(str_values))
-
         if usefilter is True and self.filter is not None:
-            query += " and " + self.filter
+            query = SQLQueries.SELECTINFILTERED.render(columns=", ".join(str_columns),
+                                                       tablename=table_adapter.key, column=chosen_column.value,
+                                                       filter=self.filter)
+        else:
+            query = SQLQueries.SELECTIN.render(columns=", ".join(str_columns), tablename=table_adapter.key,
+                                               column=chosen_column.value)
 
-        data: DataRecord = self.table_adapter.query_sql(query)
+        data: DataRecord = table_adapter.query_sql(query, parameters={"values": array_literal(chosen_elements)})
         if data is None:
-            for error in self.table_adapter.get_errors():
+            for error in table_adapter.get_errors():
                 self.throw_error(error.error_type, error.args)
             return None
 
         if len(data.data) == 0:
             self.throw_error(ErrorMessage.TRAJECTORY_NOT_EXISTING, msg="No trajectory selected")
-            for error in self.table_adapter.get_errors():
+            for error in table_adapter.get_errors():
                 self.throw_error(error.error_type, error.args)
             return None
         return data
 
     def get_trajectory_ids(self) -> Optional[DataRecord]:
-        self.check_table_adapter()
-        query = SQLQueries.SELECT.value.format(columns=Column.TRAJECTORY_ID.value)
-        query += SQLQueries.FROM.value
+        table_adapter = self.check_table_adapter()
         if self.use_trajectory_filter and self.trajecotry_filter is not None:
-            query += SQLQueries.WHERE.value.format(filter=self.trajecotry_filter)
-        query += SQLQueries.GROUPED.value.format(columns=Column.TRAJECTORY_ID.value)
+            query = SQLQueries.SELECTGROUPEDFILTERED.render(columns=Column.TRAJECTORY_ID.value,
+                                                            tablename=table_adapter.key, filter=self.trajecotry_filter)
+        else:
+            query = SQLQueries.SELECTGROUPED.render(columns=Column.TRAJECTORY_ID.value, tablename=table_adapter.key)
 
-        trajectory_ids = self.table_adapter.query_sql(query)
+        trajectory_ids = table_adapter.query_sql(query)
         if trajectory_ids is None:
-            for error in self.table_adapter.get_errors():
+            for error in table_adapter.get_errors():
                 self.throw_error(error.error_type, error.args)
             return None
         return trajectory_ids
@@ -1,6 +1,7 @@
 import random
 import re as re
 from typing import Dict
+from typing import FrozenSet
 from typing import List
 from typing import Optional
 from typing import Tuple
@@ -8,6 +9,7 @@ from uuid import UUID
 from uuid import uuid4
 
 import pandas as pd
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.sql import text
 
 from src.data_transfer.content.error import ErrorMessage
@@ -28,27 +30,36 @@ USER: str = "user"
 PASSWORD: str = "password"
 HOST: str = "host"
 PORT: str = "port"
+REQUIRED_CONNECTION_KEYS: FrozenSet[str] = frozenset((DATABASE, USER, PASSWORD, HOST, PORT))
 TABLES_TABLE: str = "initial_table"
+TABLES_TABLE_COLUMNS: str = "table_name TEXT, table_uuid TEXT, table_size DOUBLE PRECISION"
+TABLES_TABLE_COLUMN_NAMES: Tuple[str, ...] = ("table_name", "table_uuid", "table_size")
 PANDAS_TABLE: pd.DataFrame = pd.DataFrame({"table_name": [], "table_uuid": [], "table_size": []})
 INVALID_PREFIX: str = "Other Dataset: "
+DELETE_DATASET_QUERY: str = SQLQueries.DELETE.render(tablename=TABLES_TABLE, key_column="table_uuid = :key")
+UPDATE_DATASET_SIZE_QUERY: str = SQLQueries.UPDATE.render(tablename=TABLES_TABLE,
+                                                          update_columns="table_size = :size",
+                                                          key_column="table_uuid = :key")
 
 
 class PostgreSQLDatasetFacade(DatasetFacade):
     """
     Postgre Adapter for the database
     """
-
     def __init__(self, postgre_sql_data_facade: PostgreSQLDataFacade):
         super().__init__()
         self.postgre_sql_data_adapter = postgre_sql_data_facade
         self.tables_table = None
         self.table_adapters = {}
+        # uuid of the table adapter of every dataset name
+        self.dataset_uuids: Dict[str, UUID] = {}
         self.database_connection: Optional[DatabaseConnection] = None
 
     def set_connection(self, connection: Dict[str, str]) -> bool:
-        if not (DATABASE in connection.keys() and USER in connection.keys() and PASSWORD in connection.keys() and
-                HOST in connection.keys() and PORT in connection.keys()):
-            self.throw_error(ErrorMessage.INVALID_TYPE, "The connection is invalid.")
+        missing_keys = REQUIRED_CONNECTION_KEYS.difference(connection)
+        if missing_keys:
+            self.throw_error(ErrorMessage.INVALID_TYPE,
+                             "The connection is invalid. Missing parameters: " + ", ".join(sorted(missing_keys)))
             return False
 
         self.database_connection = DatabaseConnection(
@@ -60,16 +71,10 @@ class PostgreSQLDatasetFacade(DatasetFacade):
         return True
 
     def get_data_set_meta(self, dataset_uuid: UUID) -> Optional[DatasetRecord]:
-        if not (dataset_uuid in self.table_adapters.keys()):
+        table_adapter = self.table_adapters.get(dataset_uuid)
+        if table_adapter is None:
             raise InvalidUUID("This UUID is not existing.")
-
-        data = self.table_adapters.get(dataset_uuid).to_data_set_record()
-        if data is None:
-            for table in self.table_adapters:
-                for error in table.get_errors():
-                    self.throw_error(error.error_type, error.args)
-            return None
-        return data
+        return table_adapter.to_data_set_record()
 
     def delete_dataset(self, dataset_uuid: UUID) -> bool:
         if not (dataset_uuid in self.table_adapters.keys()):
@@ -81,11 +86,10 @@ class PostgreSQLDatasetFacade(DatasetFacade):
             for error in table_adapter.get_errors():
                 self.throw_error(error.error_type, error.args)
             return False
-        delete_query = SQLQueries.DELETE.value.format(tablename=TABLES_TABLE,
-                                                      key_column="table_uuid = " + "'" +
-                                                                 self.table_adapters[dataset_uuid].key + "'")
-        self.tables_table.query_sql(delete_query, False)
+        self.tables_table.query_sql(DELETE_DATASET_QUERY, False, {"key": table_adapter.key})
         del self.table_adapters[dataset_uuid]
+        if self.dataset_uuids.get(table_adapter.name) == dataset_uuid:
+            del self.dataset_uuids[table_adapter.name]
         return True
 
     def set_current_dataset(self, dataset_uuid: UUID) -> bool:
@@ -98,23 +102,15 @@ class PostgreSQLDatasetFacade(DatasetFacade):
         return True
 
     def add_dataset(self, data: DataRecord, append: bool = False) -> Optional[UUID]:
-        number_of_tables = len(self.table_adapters)
-        random_int = random.randint(0, RANDOM_MAX)
-        uuid = uuid4()
         name = data.name
-        key = "trajectory_analysis_tool_" + str(random_int) + "_" + re.sub(r'[^a-zA-Z]', '', name)
-
-        table_adapter = TableAdapter(self.database_connection)
-        table_adapter.from_existing_table(name=name, uuid=uuid, key=key)
-
-        already_existing = False
-        for uuid_key, value in self.table_adapters.items():
-            if value.name == data.name:
-                already_existing = True
-                uuid = uuid_key
-                table_adapter = self.table_adapters[uuid]
-
-        if not already_existing:
+        already_existing = name in self.dataset_uuids
+        if already_existing:
+            table_adapter = self.table_adapters[self.dataset_uuids[name]]
+        else:
+            random_int = random.randint(0, RANDOM_MAX)
+            key = "trajectory_analysis_tool_" + str(random_int) + "_" + re.sub(r'[^a-zA-Z]', '', name)
+            table_adapter = TableAdapter(self.database_connection)
+            table_adapter.from_existing_table(name=name, uuid=uuid4(), key=key)
             append = False
 
         if not table_adapter.insert_data(data.data, append=append, add_geometry=True):
@@ -123,25 +119,19 @@ class PostgreSQLDatasetFacade(DatasetFacade):
             return None
 
         if not already_existing:
-            self.table_adapters[table_adapter.uuid] = table_adapter
-            insert = pd.DataFrame({"table_name": [table_adapter.name],
-                                   "table_uuid": [table_adapter.key],
-                                   "table_size": [table_adapter.size]})
-            self.tables_table.insert_data(insert, append=True, add_geometry=False)
+            self.add_table_adapter(table_adapter)
+            self.tables_table.insert_rows(TABLES_TABLE_COLUMN_NAMES,
+                                          [(table_adapter.name, table_adapter.key, table_adapter.size)])
         if already_existing:
-            update_query = SQLQueries.UPDATE.value.format(tablename="initial_table",
-                                                          update_columns=("table_size = '" + str(table_adapter.size)
-                                                                          + "'"),
-                                                          key_column="table_uuid = '" + key + "'")
-            self.tables_table.query_sql(update_query, False)
+            self.tables_table.query_sql(UPDATE_DATASET_SIZE_QUERY, False,
+                                        {"size": table_adapter.size, "key": table_adapter.key})
 
         return table_adapter.uuid
 
     def get_data_sets_as_dict(self) -> Dict[str, int]:
         data_sets: dict[str, int] = {}
         for key, table_adapter in self.table_adapters.items():
-            table_adapter_record = table_adapter.to_data_set_record()
-            data_sets[key] = table_adapter_record.size
+            data_sets[key] = table_adapter.size
         return data_sets
 
     def set_data_sets_as_dict(self) -> Optional[List[UUID]]:
@@ -153,69 +143,91 @@ class PostgreSQLDatasetFacade(DatasetFacade):
             return None
 
         self.tables_table = TableAdapter(self.database_connection)
+        self.tables_table.from_existing_table(TABLES_TABLE, TABLES_TABLE, uuid4())
         if not self.get_tables_table(rows):
-            self.tables_table.from_existing_table("initial_table", "initial_table", uuid4())
-            self.tables_table.query_sql(SQLQueries.CREATETABLE.value.format(tablename=TABLES_TABLE,
-                                                                            columns="table_name TEXT, table_uuid TEXT, "
-                                                                                    "table_size DOUBLE PRECISION"),
-                                        False)
-        else:
-            self.tables_table = TableAdapter(self.database_connection)
-            self.tables_table.from_existing_table("initial_table", "initial_table", uuid4())
-
-        table_data = self.tables_table.query_sql(SQLQueries.SELECT_FROM.value.format(columns=("table_name" +
-                                                                                              "," +
-                                                                                              "table_uuid" + "," +
-                                                                                              "table_size"),
-                                                                                     tablename="{tablename}"))
-
-        if table_data is None:
-            if len(self.tables_table.get_errors()) > 0:
-                self.throw_error(self.tables_table.get_errors()[0].error_type, self.tables_table.get_errors()[0].args)
+            self.tables_table.query_sql(SQLQueries.CREATETABLE.render(tablename=TABLES_TABLE,
+                                                                      columns=TABLES_TABLE_COLUMNS), False)
+
+        table_rows = self.get_tables_table_rows()
+        if table_rows is None:
             return []
-        table_data = table_data.data
 
-        for i, (name, key, size) in table_data[["table_name", "table_uuid", "table_size"]].iterrows():
+        for name, key, size in table_rows:
             uuid = uuid4()
             table_adapter = TableAdapter(self.database_connection)
             table_adapter.from_existing_table(name=name, key=key, uuid=uuid, size=size)
-            self.table_adapters[uuid] = table_adapter
+            self.add_table_adapter(table_adapter)
             dataset_ids.append(table_adapter.uuid)
 
         # Add othter datasets and mark them
+        registered_keys = {key for name, key, size in table_rows}
+        registered_keys.add(TABLES_TABLE)
         for key, size in rows:
-            if key != TABLES_TABLE:
+            if key not in registered_keys:
                 uuid = uuid4()
-                self.table_adapters[uuid] = TableAdapter(self.database_connection)
-                self.table_adapters[uuid].from_existing_table(name=INVALID_PREFIX + key, key=key, uuid=uuid4(),
-                                                              size=size)
+                table_adapter = TableAdapter(self.database_connection)
+                table_adapter.from_existing_table(name=INVALID_PREFIX + key, key=key, uuid=uuid, size=size)
+                self.add_table_adapter(table_adapter)
                 dataset_ids.append(uuid)
 
         return dataset_ids
 
+    def add_table_adapter(self, table_adapter: TableAdapter):
+        """
+        registers the table adapter of a dataset under its uuid and name
+        :param table_adapter: the table adapter
+        """
+        self.table_adapters[table_adapter.uuid] = table_adapter
+        self.dataset_uuids[table_adapter.name] = table_adapter.uuid
+
     def get_tables_from_sql(self) -> Optional[List[Tuple[str, int]]]:
+        query = SQLQueries.GET_TABLES_WITH_SIZE.value
+        log_query(query)
         try:
-            database_connection = self.database_connection.get_connection()
+            with self.database_connection.connect() as database_connection:
+                rows = database_connection.execute(text(query)).fetchall()
         except DatabaseConnectionError as e:
             self.throw_error(ErrorMessage.DATABASE_CONNECTION_ERROR, ErrorMessage.DETAIL_MESSAGE.value + str(e.args))
             return None
-        query = SQLQueries.GET_TABLES_WITH_SIZE.value
+        return [(name, size) for name, size in rows]
+
+    def get_tables_table_rows(self) -> Optional[List[Tuple[str, str, float]]]:
+        """
+        fetches name, key and size of every dataset registered in the tables table
+        :return: the rows of the tables table
+        """
+        query = SQLQueries.SELECT_FROM.render(columns=", ".join(TABLES_TABLE_COLUMN_NAMES), tablename=TABLES_TABLE)
         log_query(query)
-        cursor = database_connection.execute(text(query))
-
-        rows = cursor.fetchall()
-        cursor.close()
-        tables = []
-        for name, size in rows:
-            tables.append((name, size))
-        return tables
+        try:
+            with self.database_connection.connect() as database_connection:
+                rows = database_connection.execute(text(query)).fetchall()
+        except DatabaseConnectionError as e:
+            self.throw_error(ErrorMessage.DATABASE_CONNECTION_ERROR, ErrorMessage.DETAIL_MESSAGE.value + str(e.args))
+            return None
+        except SQLAlchemyError as err:
+            self.throw_error(ErrorMessage.DATABASE_CONNECTION_IMPOSSIBLE, str(err))
+            return None
+        return [(name, key, size) for name, key, size in rows]
+
+    def table_exists_in_database(self, table_name: str) -> bool:
+        """
+        checks on the database server whether a table with the given name exists
+        :param table_name: the name of the table
+        :return: whether the table exists
+        """
+        query = SQLQueries.TABLE_EXISTS.value
+        log_query(query)
+        try:
+            with self.database_connection.connect() as database_connection:
+                return database_connection.execute(text(query).bindparams(name=table_name)).first() is not None
+        except DatabaseConnectionError as e:
+            self.throw_error(ErrorMessage.DATABASE_CONNECTION_ERROR, ErrorMessage.DETAIL_MESSAGE.value + str(e.args))
+            return False
 
     def get_columns(self, table_name: str) -> List[str]:
-        database_connection = self.database_connection.get_connection()
-        cursor = database_connection.execute(text(SQLQueries.GET_COLUMNS.value.format(tablename=table_name)))
-        columns = cursor.fetchall()
-        cursor.close()
-        return columns
+        with self.database_connection.connect() as database_connection:
+            return database_connection.execute(text(SQLQueries.GET_COLUMNS.value), {"tablename": table_name}) \
+                .fetchall()
 
     def get_tables_table(self, rows) -> bool:
         for name, size in rows:
@@ -224,13 +236,6 @@ class PostgreSQLDatasetFacade(DatasetFacade):
         return False
 
     def table_exists(self, table_name: str, all_database: bool = False) -> bool:
-
-        tables = self.get_tables_from_sql()
-
-
         if all_database:
-            return table_name in tables
-        for key, value in self.table_adapters.items():
-            if value.name == table_name:
-                return True
-        return False
+            return self.table_exists_in_database(table_name)
+        return table_name in self.dataset_uuids
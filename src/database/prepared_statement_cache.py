@@ -0,0 +1,104 @@
+from collections import OrderedDict
+from hashlib import sha1
+from re import compile
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from sqlalchemy import Connection
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.sql import text
+
+from src.database.query_logging import log_query
+
+PREPARED_STATEMENTS_KEY: str = "prepared_statements"
+PREPARED_STATEMENTS_MAX: int = 128
+# same pattern sqlalchemy uses for the bind parameters of text(), so :: casts are not mistaken for parameters
+BIND_PARAMETER = compile(r"(?<![:\w\\]):(\w+)(?!:)")
+
+
+def positional_parameters(query: str) -> Tuple[str, List[str]]:
+    """
+    rewrites the named bind parameters of the query to the positional parameters of PREPARE
+    :param query: the query with named bind parameters (:name)
+    :return: the query with $1, $2, ... and the parameter names in the order of their positions
+    """
+    names = list(dict.fromkeys(BIND_PARAMETER.findall(query)))
+    positions = {name: "$" + str(index) for index, name in enumerate(names, 1)}
+    return BIND_PARAMETER.sub(lambda bind: positions[bind.group(1)], query), names
+
+
+class PreparedStatementCache:
+    """
+    prepares select queries once per database session and executes the prepared statement afterwards, so postgres
+    parses and plans repeated queries only once. The statements are stored in the info of the pooled connection,
+    as they only exist in the session they were prepared in.
+    """
+
+    def __init__(self, max_size: int = PREPARED_STATEMENTS_MAX):
+        self.max_size = max_size
+        # raised whenever a table is recreated or dropped, so the statements prepared on its old columns are not
+        # executed again on any connection. They are deallocated once the cache of their connection overflows.
+        self.generations: Dict[str, int] = {}
+
+    def statement_name(self, query: str, table: str) -> str:
+        """
+        :param query: the query of the statement
+        :param table: the table the query reads from
+        :return: the name the query is prepared under
+        """
+        generation = self.generations.get(table, 0)
+        return "s_" + sha1((str(generation) + ":" + query).encode()).hexdigest()
+
+    def prepare(self, connection: Connection, query: str, table: str) -> str:
+        """
+        prepares the query on the connection if it is not prepared yet
+        :param connection: the connection the query is executed on
+        :param query: the query with named bind parameters (:name)
+        :param table: the table the query reads from
+        :return: the EXECUTE statement taking the same bind parameters as the query
+        """
+        prepare_query, names = positional_parameters(query)
+        statement = self.statement_name(query, table)
+        statements: OrderedDict = connection.connection.info.setdefault(PREPARED_STATEMENTS_KEY, OrderedDict())
+
+        if statement in statements:
+            statements.move_to_end(statement)
+        else:
+            prepare_query = "PREPARE " + statement + " AS " + prepare_query
+            log_query(prepare_query)
+            connection.execute(text(prepare_query))
+            statements[statement] = True
+            if len(statements) > self.max_size:
+                evicted, _ = statements.popitem(last=False)
+                connection.execute(text("DEALLOCATE " + evicted))
+
+        if len(names) == 0:
+            return "EXECUTE " + statement
+        return "EXECUTE " + statement + "(" + ", ".join(":" + name for name in names) + ")"
+
+    def discard(self, connection: Connection, query: str, table: str) -> None:
+        """
+        deallocates the statement of a query that failed, so it is prepared again on the next call. Rolls back the
+        failed transaction first, as postgres rejects any other command until then.
+        :param connection: the connection the query failed on
+        :param query: the query with named bind parameters (:name)
+        :param table: the table the query reads from
+        """
+        statement = self.statement_name(query, table)
+        try:
+            statements: OrderedDict = connection.connection.info.get(PREPARED_STATEMENTS_KEY, OrderedDict())
+            if statements.pop(statement, None) is None:
+                return
+            connection.rollback()
+            connection.execute(text("DEALLOCATE " + statement))
+        except SQLAlchemyError:
+            # the connection is broken, its statements are gone with the session
+            pass
+
+    def forget(self, table: str) -> None:
+        """
+        retires the statements of a table, to be called when the table is recreated or dropped
+        :param table: the table
+        """
+        self.generations[table] = self.generations.get(table, 0) + 1
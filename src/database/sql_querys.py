@@ -1,25 +1,52 @@
 from enum import Enum
+from string import Formatter
+from typing import Callable
+from typing import Iterable
+
+
+def compile_renderer(template: str) -> Callable[..., str]:
+    """
+    compiles a query template into a function building the query with an f-string, which is cheaper than parsing
+    the template with str.format on every call
+    :param template: the template with {identifier} fields
+    :return: the function taking the identifiers as keyword arguments
+    """
+    fields = []
+    parts = []
+    for literal, field, _, _ in Formatter().parse(template):
+        if literal:
+            parts.append(repr(literal))
+        if field is not None:
+            fields.append(field)
+            parts.append("f'{" + field + "}'")
+    parameters = ", ".join(dict.fromkeys(fields))
+    source = "def render(" + ("*, " + parameters if parameters else "") + "):\n    return " + " ".join(parts)
+    namespace = {}
+    exec(source, namespace)
+    return namespace["render"]
 
 
 class SQLQueries(Enum):
     """
-    holds all sql queries
+    holds all sql queries, values are passed as named bind parameters (:name), only identifiers are formatted
+    with the render function of the query, e.g. SQLQueries.DROPTABLE.render(tablename=...)
     """
 
+    def __init__(self, template: str):
+        self.render = compile_renderer(template)
+
     CREATETABLE = "CREATE TABLE {tablename} ({columns})"
     DROPTABLE = "DROP TABLE {tablename};"
-    SELECT = "SELECT {columns}"
-    FROM = " FROM {tablename} AS t"
-    WHERE = " WHERE {filter}"
-    SELECT_FROM = "SELECT {columns} FROM {tablename}"
-    SELECTFILTERED = "SELECT {columns} FROM {tablename} WHERE {filter}"
-    NOT = "NOT({filter})"
-    SELECTGROUPEDFILTERED = "SELECT {data} FROM {tablename} WHERE {filter} GROUP BY {data}"
-    GROUPED = " GROUP BY {columns}"
-    WHEREIN = " WHERE {column} IN ({values})"
-    SELECTINFILTERED = "SELECT {columns} FROM {tablename} WHERE {data} IN ({values}) AND {filter}"
-    INSERT = "INSERT INTO {tablename} VALUES {values}"
-    GET_COLUMNS = "SELECT column_name FROM information_schema.columns WHERE table_name = '{tablename}'"
+    # the dataset table is aliased as t, trajectory filters refer to it from their subqueries
+    SELECT_FROM = "SELECT {columns} FROM {tablename} AS t"
+    SELECTFILTERED = "SELECT {columns} FROM {tablename} AS t WHERE {filter}"
+    SELECTGROUPED = "SELECT {columns} FROM {tablename} AS t GROUP BY {columns}"
+    SELECTGROUPEDFILTERED = "SELECT {columns} FROM {tablename} AS t WHERE {filter} GROUP BY {columns}"
+    SELECTIN = "SELECT {columns} FROM {tablename} AS t WHERE {column} = ANY(:values)"
+    SELECTINFILTERED = "SELECT {columns} FROM {tablename} AS t WHERE {column} = ANY(:values) AND ({filter})"
+    INSERT = "INSERT INTO {tablename} ({columns}) VALUES %s"
+    TABLE_EXISTS = "SELECT 1 FROM information_schema.tables WHERE table_name = :name LIMIT 1"
+    GET_COLUMNS = "SELECT column_name FROM information_schema.columns WHERE table_name = :tablename"
     GET_TABLES_WITH_SIZE = """
                             SELECT 
                                 table_name, 
@@ -36,7 +63,7 @@ class SQLQueries(Enum):
                     FROM
                         information_schema.tables
                     WHERE
-                        table_name='{tablename}'
+                        table_name = :tablename
                     LIMIT 1
                     """
     UPDATE = """UPDATE {tablename}
@@ -44,3 +71,13 @@ class SQLQueries(Enum):
                 WHERE {key_column}"""
     DELETE = """DELETE FROM {tablename}
                 WHERE {key_column}"""
+
+
+def array_literal(values: Iterable) -> str:
+    """
+    builds a postgres array literal of the values to be bound as one parameter, e.g. for = ANY(:values).
+    The literal is untyped, so postgres casts it to an array of the compared column's type.
+    :param values: the values of the array
+    :return: the array literal
+    """
+    return "{" + ",".join('"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"' for value in values) + "}"
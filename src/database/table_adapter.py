@@ -1,9 +1,16 @@
+from io import StringIO
 from re import compile
 from re import match
+from typing import Dict
+from typing import Iterable
+from typing import List
 from typing import Optional
+from typing import Tuple
 from uuid import UUID
 
 import pandas
+from psycopg2 import Error as PsycopgError
+from psycopg2.extras import execute_values
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.sql import text
 
@@ -12,6 +19,7 @@ from src.data_transfer.content.error import ErrorMessage
 from src.data_transfer.exception.custom_exception import DatabaseConnectionError
 from src.data_transfer.record.data_record import DataRecord
 from src.data_transfer.record.data_set_record import DatasetRecord
+from src.database.prepared_statement_cache import PreparedStatementCache
 from src.database.query_logging import log_query
 from src.database.sql_querys import SQLQueries
 from src.model.error_handler import ErrorHandler
@@ -21,6 +29,44 @@ REGEX = compile('.*')
 SQL_SUFFIX = ";"
 
 APPEND: dict = {True: "append", False: "replace"}
+INSERT_CHUNK_SIZE: int = 10_000
+INSERT_PAGE_SIZE: int = 1_000
+COPY_QUERY: str = 'COPY {tablename} ({columns}) FROM STDIN WITH CSV'
+PREPARED_STATEMENTS: PreparedStatementCache = PreparedStatementCache()
+
+
+def csv_field(value) -> str:
+    """
+    formats a value as csv field for COPY. Only None, which pandas also passes for NaN, is left unquoted, as COPY
+    reads an unquoted empty field as NULL, while a quoted one stays an empty string
+    :param value: the value of the field
+    :return: the csv field
+    """
+    if value is None:
+        return ""
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def psql_insert_copy(table, connection, keys: List[str], data_iter: Iterable) -> None:
+    """
+    insert method for pandas.DataFrame.to_sql, that streams the rows to postgresql with COPY instead of
+    sending one INSERT per row
+    :param table: the pandas sql table
+    :param connection: the sqlalchemy connection
+    :param keys: the column names
+    :param data_iter: the rows to be inserted
+    """
+    buffer = StringIO()
+    buffer.writelines(",".join(csv_field(value) for value in row) + "\n" for row in data_iter)
+    buffer.seek(0)
+
+    tablename = '"{}"'.format(table.name)
+    if table.schema:
+        tablename = '"{}".{}'.format(table.schema, tablename)
+    columns = ", ".join('"{}"'.format(key) for key in keys)
+
+    with connection.connection.cursor() as cursor:
+        cursor.copy_expert(sql=COPY_QUERY.format(tablename=tablename, columns=columns), file=buffer)
 
 
 class TableAdapter(ErrorHandler):
@@ -35,6 +81,8 @@ class TableAdapter(ErrorHandler):
         self.size = None
         self.uuid = None
         self.db_key = None
+        # distinct values per column name, cleared whenever the table changes
+        self.distinct_values: Dict[str, DataRecord] = {}
 
     def from_existing_table(self, name: str, key: str, uuid: UUID, size: int = 0):
         """
@@ -54,6 +102,10 @@ class TableAdapter(ErrorHandler):
         if match(REGEX, self.key) is None:
             self.throw_error(ErrorMessage.DATASET_NAME_INVALID, msg=f"Dataset name '{self.key}' is not valid!")
             return False
+        self.distinct_values.clear()
+        if not append:
+            # the table is recreated, possibly with other column types
+            PREPARED_STATEMENTS.forget(self.key)
 
         """# Aggregate longitude and latitude
         stack_lonlat = data_record.data.agg({'longitude': np.stack, 'latitude': np.stack})
@@ -66,55 +118,71 @@ class TableAdapter(ErrorHandler):
         """
 
         if add_geometry:
-            data[GEOMETRY] = data.apply(lambda row:
-                                        "LineString(" + str(row['longitude']) +
-                                        " " +
-                                        str(row['latitude']) + ")", axis=1)
+            data = data.copy(deep=False)
+            data[GEOMETRY] = "LineString(" + data['longitude'].astype(str) + " " + data['latitude'].astype(str) + ")"
 
         try:
             connection = self.database_connection.get_connection()
             log_query("Creating table " + self.key)
-            data.to_sql(name=self.key, con=connection, if_exists=APPEND[append], index=False)
+            data.to_sql(name=self.key, con=connection, if_exists=APPEND[append], index=False,
+                        method=psql_insert_copy, chunksize=INSERT_CHUNK_SIZE)
+
+            # Get size on the same connection, the transaction already sees the inserted rows
+            query = SQLQueries.TABLE_SIZE.value + SQL_SUFFIX
+            log_query(query)
+            size_cursor = connection.execute(text(query), {"tablename": self.key})
+            self.size = size_cursor.fetchone()[0]
+            size_cursor.close()
             self.database_connection.post_connection()
-        except SQLAlchemyError as err:
+        except (SQLAlchemyError, PsycopgError) as err:
             self.throw_error(ErrorMessage.DATABASE_CONNECTION_IMPOSSIBLE, str(err))
             self.database_connection.recover()
             return False
         except DatabaseConnectionError as e:
             self.throw_error(ErrorMessage.DATABASE_CONNECTION_IMPOSSIBLE, str(e))
             return False
+
+        return True
+
+    def insert_rows(self, columns: Iterable[str], rows: Iterable[Tuple]) -> bool:
+        """
+        inserts the rows into this table, sending INSERT_PAGE_SIZE rows per statement
+        :param columns: the columns the values of the rows belong to
+        :param rows: the rows to be inserted
+        :return: whether the rows were inserted
+        """
+        self.distinct_values.clear()
         try:
             connection = self.database_connection.get_connection()
         except DatabaseConnectionError as e:
             self.throw_error(ErrorMessage.DATABASE_CONNECTION_IMPOSSIBLE, str(e))
             return False
-
-            # Get size
+        query = SQLQueries.INSERT.render(tablename=self.key, columns=", ".join(columns))
+        log_query(query)
         try:
-            query = SQLQueries.TABLE_SIZE.value.format(tablename=self.key) + SQL_SUFFIX
-            log_query(query)
-            query = text(query)
-            size_cursor = connection.execute(query)
-            self.size = size_cursor.fetchone()[0]
-            size_cursor.close()
+            # the dbapi cursor bypasses sqlalchemy, so the transaction has to be begun explicitly to be committed
+            connection.begin()
+            with connection.connection.cursor() as cursor:
+                execute_values(cursor, query, rows, page_size=INSERT_PAGE_SIZE)
             self.database_connection.post_connection()
-        except SQLAlchemyError as err:
+        except (SQLAlchemyError, PsycopgError) as err:
             self.throw_error(ErrorMessage.DATABASE_CONNECTION_IMPOSSIBLE, str(err))
             self.database_connection.recover()
             return False
-
         return True
 
     def delete_table(self) -> bool:
         """
         deletes this table
         """
+        self.distinct_values.clear()
+        PREPARED_STATEMENTS.forget(self.key)
         try:
             connection = self.database_connection.get_connection()
         except DatabaseConnectionError as e:
             self.throw_error(ErrorMessage.DATABASE_CONNECTION_IMPOSSIBLE, str(e))
             return False
-        query = SQLQueries.DROPTABLE.value.format(tablename=self.key)
+        query = SQLQueries.DROPTABLE.render(tablename=self.key)
         log_query(query)
         query = text(query)
         try:
@@ -134,10 +202,12 @@ class TableAdapter(ErrorHandler):
         """
         return DatasetRecord(self.name, self.size)
 
-    def query_sql(self, query: str, pandas_query: bool = True) -> Optional[DataRecord]:
+    def query_sql(self, query: str, pandas_query: bool = True, parameters: Optional[Dict] = None) \
+            -> Optional[DataRecord]:
         """
         gets the by the query filtered data
         :param query:   the sql query
+        :param parameters: values for the bind parameters of the query
         :return the data
         """
         try:
@@ -147,16 +217,18 @@ class TableAdapter(ErrorHandler):
             return None
         query = query.format(tablename=self.key) + SQL_SUFFIX
         log_query(query)
-        query = text(query)
         try:
             if pandas_query:
-                result = pandas.read_sql_query(query, connection)
+                execute_query = PREPARED_STATEMENTS.prepare(connection, query, self.key)
+                result = pandas.read_sql_query(text(execute_query), connection, params=parameters)
             else:
-                connection.execute(query)
+                connection.execute(text(query), parameters)
                 result = None
             self.database_connection.post_connection()
         except SQLAlchemyError as err:
             self.throw_error(ErrorMessage.DATABASE_CONNECTION_IMPOSSIBLE, str(err))
+            if pandas_query:
+                PREPARED_STATEMENTS.discard(connection, query, self.key)
             self.database_connection.recover()
             return None
 
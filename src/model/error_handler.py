@@ -2,7 +2,10 @@
 Errorhandler Modul contains abstract errorhandler class.
 """
 from abc import ABC
+from collections import deque
+from typing import Deque
 from typing import List
+from typing import Optional
 
 from src.data_transfer.content.error import ErrorMessage
 from src.data_transfer.record import ErrorRecord
@@ -15,29 +18,63 @@ class ErrorHandler(IErrorHandler, ABC):
     """
     ErrorHandler Class is a Composite for handling Model errors. Errors can be set and accessed.
     """
+    __slots__ = ("_error_handlers", "_errors", "_parents", "_flat_handlers")
 
     def __init__(self):
         IErrorHandler.__init__(self)
         self._error_handlers = list()
-        self._errors = list()
+        self._errors: Deque[ErrorRecord] = deque()
+        self._parents: List[ErrorHandler] = list()
+        # this handler and all underlying handlers in depth first order, None until the next get_errors
+        self._flat_handlers: Optional[List[ErrorHandler]] = None
 
     def add_error_handler(self, handler: 'ErrorHandler') -> None:
         """
-        Adds error handler to the composite.
+        Adds error handler to the composite. A handler that is already part of the composite is not added again.
         :param handler: the handler to be added.
         """
         assert issubclass(handler.__class__, ErrorHandler)
+        if any(registered is handler for registered in self._error_handlers):
+            return
         self._error_handlers.append(handler)
+        handler._parents.append(self)
+        self._invalidate_flat_handlers()
+
+    def _invalidate_flat_handlers(self) -> None:
+        """
+        Drops the flattened composite of this handler and of all handlers it is part of.
+        """
+        stack: List[ErrorHandler] = [self]
+        while stack:
+            handler = stack.pop()
+            handler._flat_handlers = None
+            stack.extend(handler._parents)
+
+    def _flatten(self) -> List['ErrorHandler']:
+        """
+        Lists this handler and all underlying handlers.
+        :return: the handlers in depth first order.
+        """
+        handlers: List[ErrorHandler] = []
+        # children are pushed reversed to keep the order they were added in
+        stack: List[ErrorHandler] = [self]
+        while stack:
+            handler = stack.pop()
+            handlers.append(handler)
+            stack.extend(reversed(handler._error_handlers))
+        return handlers
 
     def get_errors(self) -> List[ErrorRecord]:
         """
         Gets all errors from the composite.
         :return: All errors from the object and all underlying objects.
         """
-        errors: List[ErrorRecord] = self._errors
-        self._errors = list()
-        for handler in self._error_handlers:
-            errors.extend(handler.get_errors())
+        if self._flat_handlers is None:
+            self._flat_handlers = self._flatten()
+        errors: List[ErrorRecord] = []
+        for handler in self._flat_handlers:
+            errors.extend(handler._errors)
+            handler._errors.clear()
 
         return errors
 
@@ -47,5 +84,4 @@ class ErrorHandler(IErrorHandler, ABC):
         :param error: the Error to be thrown.
         :param msg: the message to be thrown.
         """
-        assert isinstance(error, ErrorMessage)
         self._errors.append(ErrorRecord(error, msg))
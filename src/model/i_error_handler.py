@@ -12,6 +12,7 @@ class IErrorHandler(ABC):
     should be implemented to return a list of all errors encountered by the implementing object and all its
     underlying objects.
     """
+    __slots__ = ("errors",)
 
     def __init__(self):
         """
@@ -1,8 +1,21 @@
 from unittest import TestCase
 
+from src.data_transfer.content.error import ErrorMessage
 from src.database.database import Database
 
 
 class TestDatabase(TestCase):
     def setUp(self) -> None:
         self.database = Database()
+
+    def test_set_connection_missing_parameters(self):
+        """
+        Test that an incomplete connection is rejected and the missing parameters are reported.
+        """
+        facade = self.database.database_facade
+        self.assertFalse(facade.set_connection({"host": "localhost", "user": "user"}))
+
+        errors = facade.get_errors()
+        self.assertEqual(1, len(errors))
+        self.assertEqual(ErrorMessage.INVALID_TYPE, errors[0].error_type)
+        self.assertIn("database, password, port", errors[0].args)
@@ -0,0 +1,116 @@
+from types import SimpleNamespace
+from unittest import TestCase
+
+from src.database.prepared_statement_cache import PREPARED_STATEMENTS_KEY
+from src.database.prepared_statement_cache import PreparedStatementCache
+from src.database.prepared_statement_cache import positional_parameters
+
+TABLE: str = "test_table"
+
+
+class FakeConnection:
+    """
+    Records the statements instead of sending them to a database.
+    """
+
+    def __init__(self):
+        self.connection = SimpleNamespace(info={})
+        self.executed = []
+
+    def execute(self, statement, parameters=None):
+        self.executed.append(str(statement))
+
+    def rollback(self):
+        self.executed.append("ROLLBACK")
+
+    def statements(self):
+        return list(self.connection.info[PREPARED_STATEMENTS_KEY])
+
+
+class TestPreparedStatementCache(TestCase):
+    def test_positional_parameters(self):
+        """
+        Test that named bind parameters become positional ones, repeated names sharing one position.
+        """
+        query, names = positional_parameters("SELECT a FROM t WHERE b = :first AND c = ANY(:values) OR b = :first")
+        self.assertEqual("SELECT a FROM t WHERE b = $1 AND c = ANY($2) OR b = $1", query)
+        self.assertEqual(["first", "values"], names)
+
+    def test_positional_parameters_ignores_casts_and_literals(self):
+        """
+        Test that casts and colons inside values are not taken for bind parameters.
+        """
+        query = "SELECT a::text FROM t WHERE time = '12:30'"
+        self.assertEqual((query, []), positional_parameters(query))
+
+    def test_prepare_once(self):
+        """
+        Test that a query is prepared on its first execution only and executed with its bind parameters.
+        """
+        cache = PreparedStatementCache()
+        connection = FakeConnection()
+
+        first = cache.prepare(connection, "SELECT a FROM t WHERE b = :b", TABLE)
+        second = cache.prepare(connection, "SELECT a FROM t WHERE b = :b", TABLE)
+
+        self.assertEqual(first, second)
+        self.assertTrue(first.startswith("EXECUTE s_") and first.endswith("(:b)"))
+        self.assertEqual(1, len(connection.executed))
+        self.assertTrue(connection.executed[0].endswith(" AS SELECT a FROM t WHERE b = $1"))
+
+    def test_eviction_deallocates_least_recently_used(self):
+        """
+        Test that overflowing the cache deallocates the statement that was used longest ago.
+        """
+        cache = PreparedStatementCache(max_size=2)
+        connection = FakeConnection()
+
+        cache.prepare(connection, "SELECT 1", TABLE)
+        cache.prepare(connection, "SELECT 2", TABLE)
+        first = cache.statement_name("SELECT 1", TABLE)
+        second = cache.statement_name("SELECT 2", TABLE)
+        cache.prepare(connection, "SELECT 1", TABLE)
+        cache.prepare(connection, "SELECT 3", TABLE)
+
+        self.assertEqual("DEALLOCATE " + second, connection.executed[-1])
+        self.assertEqual([first, cache.statement_name("SELECT 3", TABLE)], connection.statements())
+
+    def test_forget_prepares_again(self):
+        """
+        Test that the statements of a recreated table are not executed again.
+        """
+        cache = PreparedStatementCache()
+        connection = FakeConnection()
+
+        before = cache.prepare(connection, "SELECT 1", TABLE)
+        cache.forget(TABLE)
+        after = cache.prepare(connection, "SELECT 1", TABLE)
+
+        self.assertNotEqual(before, after)
+        self.assertEqual(2, len(connection.executed))
+
+    def test_discard_deallocates(self):
+        """
+        Test that the statement of a failed query is rolled back, deallocated and prepared again on the next call.
+        """
+        cache = PreparedStatementCache()
+        connection = FakeConnection()
+        statement = cache.statement_name("SELECT 1", TABLE)
+
+        cache.prepare(connection, "SELECT 1", TABLE)
+        cache.discard(connection, "SELECT 1", TABLE)
+
+        self.assertEqual(["ROLLBACK", "DEALLOCATE " + statement], connection.executed[1:])
+        self.assertEqual([], connection.statements())
+        cache.prepare(connection, "SELECT 1", TABLE)
+        self.assertTrue(connection.executed[-1].startswith("PREPARE " + statement))
+
+    def test_discard_unknown_statement(self):
+        """
+        Test that discarding a query that was never prepared sends nothing.
+        """
+        cache = PreparedStatementCache()
+        connection = FakeConnection()
+
+        cache.discard(connection, "SELECT 1", TABLE)
+        self.assertEqual([], connection.executed)
@@ -0,0 +1,51 @@
+from string import Formatter
+from unittest import TestCase
+
+from src.database.sql_querys import SQLQueries
+from src.database.sql_querys import array_literal
+from src.database.sql_querys import compile_renderer
+
+
+class TestSQLQueries(TestCase):
+    def test_array_literal_quotes_every_element(self):
+        """
+        Test that every element is quoted, so commas, braces and NULL are taken literally.
+        """
+        self.assertEqual('{"a,b"}', array_literal(["a,b"]))
+        self.assertEqual('{"{}","{x}"}', array_literal(["{}", "{x}"]))
+        self.assertEqual('{"NULL","null"}', array_literal(["NULL", "null"]))
+        self.assertEqual('{" a "}', array_literal([" a "]))
+
+    def test_array_literal_escapes_quotes_and_backslashes(self):
+        """
+        Test that double quotes and backslashes inside an element are escaped with a backslash.
+        """
+        self.assertEqual('{"a\\"b"}', array_literal(['a"b']))
+        self.assertEqual('{"a\\\\b"}', array_literal(["a\\b"]))
+        self.assertEqual('{"\\\\\\""}', array_literal(['\\"']))
+
+    def test_array_literal_mixed_values(self):
+        """
+        Test that integers and strings are written alike, postgres casts them to the type of the column.
+        """
+        self.assertEqual('{"1","x","2.5"}', array_literal([1, "x", 2.5]))
+        self.assertEqual("{}", array_literal([]))
+
+    def test_render_matches_format(self):
+        """
+        Test that the compiled renderer of every query builds the same sql as formatting its template.
+        """
+        for query in SQLQueries:
+            with self.subTest(query=query.name):
+                identifiers = {field: "<" + field + ">" for _, field, _, _ in Formatter().parse(query.value) if field}
+                self.assertEqual(query.value.format(**identifiers), query.render(**identifiers))
+
+    def test_compile_renderer(self):
+        """
+        Test that literal text with quotes, backslashes and line breaks is kept and identifiers are required.
+        """
+        render = compile_renderer("SELECT '{{a}}\\' AS \"x\"\nFROM {tablename} WHERE {column} = {column}")
+        self.assertEqual("SELECT '{a}\\' AS \"x\"\nFROM t WHERE c = c", render(tablename="t", column="c"))
+        self.assertEqual("SELECT 1", compile_renderer("SELECT 1")())
+        with self.assertRaises(TypeError):
+            render(tablename="t")
@@ -0,0 +1,53 @@
+import json
+import os
+from unittest import TestCase
+from uuid import uuid4
+
+import numpy
+import pandas
+
+from src.data_transfer.exception.custom_exception import DatabaseConnectionError
+from src.database.database_connection import DatabaseConnection
+from src.database.table_adapter import TableAdapter
+from src.database.table_adapter import csv_field
+
+CONNECTION_FILE: str = os.path.join(os.path.dirname(__file__), "..", "..", "src", "dictionary",
+                                    "sql_connection.json")
+
+
+class TestTableAdapter(TestCase):
+    def test_csv_field(self):
+        """
+        Test that only None is written as unquoted empty field, which COPY reads as NULL.
+        """
+        self.assertEqual("", csv_field(None))
+        self.assertEqual('""', csv_field(""))
+        self.assertEqual('"a ""b"", c"', csv_field('a "b", c'))
+        self.assertEqual('"1.5"', csv_field(1.5))
+
+    def test_insert_data_keeps_empty_strings_and_nan(self):
+        """
+        Test that empty strings stay empty strings and NaN becomes NULL when the data is copied into the table.
+        """
+        if not os.path.exists(CONNECTION_FILE):
+            self.skipTest("no database connection configured")
+        with open(CONNECTION_FILE) as file:
+            database_connection = DatabaseConnection(**json.load(file)[0])
+        try:
+            database_connection.connect().close()
+        except DatabaseConnectionError:
+            self.skipTest("database not reachable")
+        table_adapter = TableAdapter(database_connection)
+        table_adapter.from_existing_table(name="empty strings", key="test_empty_strings", uuid=uuid4())
+        data = pandas.DataFrame({"id": [1, 2, 3], "name": ["", None, "x"], "value": [1.5, numpy.nan, 2.0]})
+
+        self.assertTrue(table_adapter.insert_data(data, add_geometry=False))
+        try:
+            result = table_adapter.query_sql("SELECT name IS NULL AS name_null, name, value IS NULL AS value_null "
+                                             "FROM {tablename} ORDER BY id").data
+        finally:
+            table_adapter.delete_table()
+
+        self.assertEqual([False, True, False], list(result["name_null"]))
+        self.assertEqual("", result["name"][0])
+        self.assertEqual([False, True, False], list(result["value_null"]))
@@ -0,0 +1,80 @@
+import unittest
+
+from src.data_transfer.content.error import ErrorMessage
+from src.model.error_handler import ErrorHandler
+
+
+class ConcreteErrorHandler(ErrorHandler):
+    """
+    Minimal error handler used to build composites in the tests.
+    """
+    pass
+
+
+class TestErrorHandler(unittest.TestCase):
+    def test_get_errors_collects_children(self):
+        """
+        Test that the errors of the handler and all underlying handlers are returned and then cleared.
+        """
+        root = ConcreteErrorHandler()
+        child = ConcreteErrorHandler()
+        grandchild = ConcreteErrorHandler()
+        root.add_error_handler(child)
+        child.add_error_handler(grandchild)
+
+        root.throw_error(ErrorMessage.INPUT_NONE, "root")
+        grandchild.throw_error(ErrorMessage.INVALID_TYPE, "grandchild")
+
+        errors = root.get_errors()
+        self.assertEqual(["root", "grandchild"], [error.args for error in errors])
+        self.assertEqual([ErrorMessage.INPUT_NONE, ErrorMessage.INVALID_TYPE],
+                         [error.error_type for error in errors])
+        self.assertEqual([], root.get_errors())
+
+    def test_get_errors_keeps_order_of_siblings(self):
+        """
+        Test that the errors of sibling handlers are returned in the order the handlers were added.
+        """
+        root = ConcreteErrorHandler()
+        first = ConcreteErrorHandler()
+        second = ConcreteErrorHandler()
+        first_child = ConcreteErrorHandler()
+        root.add_error_handler(first)
+        root.add_error_handler(second)
+        first.add_error_handler(first_child)
+
+        second.throw_error(ErrorMessage.INPUT_NONE, "second")
+        first_child.throw_error(ErrorMessage.INPUT_NONE, "first child")
+        first.throw_error(ErrorMessage.INPUT_NONE, "first")
+
+        self.assertEqual(["first", "first child", "second"], [error.args for error in root.get_errors()])
+
+    def test_get_errors_after_adding_to_child(self):
+        """
+        Test that a handler added below an already collected composite is collected by the root as well.
+        """
+        root = ConcreteErrorHandler()
+        child = ConcreteErrorHandler()
+        root.add_error_handler(child)
+        self.assertEqual([], root.get_errors())
+
+        grandchild = ConcreteErrorHandler()
+        child.add_error_handler(grandchild)
+        grandchild.throw_error(ErrorMessage.INPUT_NONE, "grandchild")
+        self.assertEqual(["grandchild"], [error.args for error in root.get_errors()])
+
+    def test_add_error_handler_twice(self):
+        """
+        Test that adding the same handler twice does not report its errors twice.
+        """
+        root = ConcreteErrorHandler()
+        child = ConcreteErrorHandler()
+        root.add_error_handler(child)
+        root.add_error_handler(child)
+
+        child.throw_error(ErrorMessage.INPUT_NONE)
+        self.assertEqual(1, len(root.get_errors()))
+
+
+if __name__ == '__main__':
+    unittest.main()